@@ -15,15 +15,19 @@ layout:
     xor-encrypted bytes
 """
 import sys
-import argparse
+import os
+import mmap
+import stat
 import struct
-from pathlib import Path
+import functools
+from contextlib import contextmanager
 
 __version__ = "1.1.1"
 
 SAVE_HDR_SIZE = 0x108
 SAVE_DATA_SIZE = 0x574
 KEY_SIZE = 256
+_MAGIC_F32_ONE = b'\x00\x00\x80\x3f'  # float32 1.0f, little-endian
 
 class Colors:
     RED = '\033[91m'
@@ -33,8 +37,11 @@ class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
 
+# checked once; main() clears it for --no-color
+_IS_TTY = bool(getattr(sys.stdout, 'isatty', lambda: False)())
+
 def colorize(text, color, force_color=False):
-    if force_color or (hasattr(sys.stdout, 'isatty') and sys.stdout.isatty()):
+    if force_color or _IS_TTY:
         return f"{color}{text}{Colors.RESET}"
     return text
 
@@ -55,55 +62,131 @@ def log_success(msg, quiet=False, color=True):
     if not quiet:
         print(colorize(msg, Colors.GREEN) if color else msg)
 
+# maps non-printable bytes to '.' for the hexdump ascii column
+_PRINT_TBL = bytes(i if 32 <= i <= 126 else 0x2E for i in range(256))
+
 def hexdump(data, offset=0, width=16, show_ascii=True):
-    lines = []
+    out = bytearray()
+    hex_width = width * 3 - 1
     for i in range(0, len(data), width):
         chunk = data[i:i+width]
-        hex_part = ' '.join(f'{b:02x}' for b in chunk).ljust(width * 3 - 1)
+        if out:
+            out += b'\n'
+        out += f"{offset + i:08x}  ".encode()
+        out += chunk.hex(' ').ljust(hex_width).encode()
         if show_ascii:
-            ascii_part = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-            line = f"{offset + i:08x}  {hex_part}  |{ascii_part}|"
-        else:
-            line = f"{offset + i:08x}  {hex_part}"
-        lines.append(line)
-    return '\n'.join(lines)
+            out += b'  |'
+            out += chunk.translate(_PRINT_TBL)
+            out += b'|'
+    return out.decode('ascii')
 
 def validate_file_exists(path, name="file"):
-    p = Path(path)
-    if not p.exists():
+    # single stat covers both the existence and regular-file checks; like Path.exists(),
+    # any stat failure (missing, ELOOP, EACCES on a parent) counts as not existing
+    try:
+        st = os.stat(path)
+    except OSError:
         log_error(f"{name} '{path}' does not exist")
         return False
-    if not p.is_file():
+    if not stat.S_ISREG(st.st_mode):
         log_error(f"'{path}' is not a file")
         return False
     return True
 
 def check_overwrite(path, force=False, quiet=False):
-    if Path(path).exists() and not force:
+    exists = os.path.exists(path)
+    if exists and not force:
         log_error(f"output file '{path}' exists (use --force to overwrite)")
         return False
-    if Path(path).exists() and force:
+    if exists and force:
         log_warning(f"overwriting '{path}'", quiet)
     return True
 
+@contextmanager
+def map_save(file_path):
+    # read-only mapping of the whole file; mmap refuses empty files, so hand back b'' for those
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    # optional, imported on first use so commands that never touch the payload skip it
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+# importing numpy (~60 ms) only pays off from about this size; save payloads are 1396 bytes
+_NUMPY_MIN_BYTES = 16 << 20
+
+def _numpy_for(n: int):
+    # numpy for an n-byte buffer, or None to stay on the big-int/translate paths
+    return _numpy() if n >= _NUMPY_MIN_BYTES else None
+
+@functools.lru_cache(maxsize=8)
+def _tile_key(key: bytes, n: int) -> bytes:
+    return (key * ((n + len(key) - 1) // len(key)))[:n]
+
+def _xor_np(np, data: bytes, key: bytes):
+    # broadcast the key over whole key-length rows (5 for the save payload), then the tail
+    n = len(data)
+    klen = len(key)
+    full = n - n % klen
+    d = np.frombuffer(data, dtype=np.uint8)
+    k = np.frombuffer(key, dtype=np.uint8)
+    out = np.empty(n, dtype=np.uint8)
+    np.bitwise_xor(d[:full].reshape(-1, klen), k, out=out[:full].reshape(-1, klen))
+    np.bitwise_xor(d[full:], k[:n - full], out=out[full:])
+    return out
+
 def xor_crypt(data: bytes, key: bytes) -> bytes:
     if not key:
         return data
-    out = bytearray(len(data))
-    klen = len(key)
-    for i, b in enumerate(data):
-        out[i] = b ^ key[i % klen]
-    return bytes(out)
+    if not any(key):
+        # all-zero key (unencrypted save): xor is the identity
+        return bytes(data)
+    n = len(data)
+    np = _numpy_for(n)
+    if np is not None:
+        return _xor_np(np, data, key).tobytes()
+    # tile the key over the payload (cached per key/length), then xor as two big ints
+    tiled = _tile_key(bytes(key), n)
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(tiled, 'big')).to_bytes(n, 'big')
+
+def _crc16_table_entry(i: int) -> int:
+    crc = i << 8
+    for _ in range(8):
+        # branchless: xor in the polynomial only when the top bit was set
+        crc = ((crc << 1) ^ (0x1021 & -((crc >> 15) & 1))) & 0xFFFF
+    return crc
+
+_CRC16_CCITT_TABLE = tuple(_crc16_table_entry(i) for i in range(256))
+
+def _crc16_shift_table(prev: tuple) -> tuple:
+    # same byte pushed through 8 more zero bits
+    t0 = _CRC16_CCITT_TABLE
+    return tuple(((c << 8) & 0xFFFF) ^ t0[c >> 8] for c in prev)
+
+# slice-by-4 tables: _CRC16_SLICE[k][b] is byte b followed by k zero bytes
+_CRC16_SLICE = [_CRC16_CCITT_TABLE]
+for _ in range(3):
+    _CRC16_SLICE.append(_crc16_shift_table(_CRC16_SLICE[-1]))
+_CRC16_SLICE = tuple(_CRC16_SLICE)
 
 def crc16_ccitt_false(data: bytes, seed: int = 0xFFFF) -> int:
     crc = seed & 0xFFFF
-    for b in data:
-        crc ^= (b << 8) & 0xFFFF
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
+    t0, t1, t2, t3 = _CRC16_SLICE
+    n4 = len(data) & ~3
+    for w, in struct.iter_unpack('>I', memoryview(data)[:n4]):
+        x = crc ^ (w >> 16)
+        crc = t3[x >> 8] ^ t2[x & 0xFF] ^ t1[(w >> 8) & 0xFF] ^ t0[w & 0xFF]
+    for b in data[n4:]:
+        crc = ((crc << 8) & 0xFFFF) ^ t0[(crc >> 8) ^ b]
     return crc
 
 def extract_key(file_path: str) -> bytes | None:
@@ -120,17 +203,42 @@ def build_header(key: bytes, crc16: int) -> bytes:
     if len(key) != KEY_SIZE:
         raise ValueError("key must be 256 bytes")
     hdr = bytearray(SAVE_HDR_SIZE)
-    hdr[0:4] = struct.pack("<f", 1.0)
+    hdr[0:4] = _MAGIC_F32_ONE
     hdr[4:4+KEY_SIZE] = key
-    hdr[260:264] = struct.pack("<I", crc16 & 0xFFFF)
+    hdr[260:264] = (crc16 & 0xFFFF).to_bytes(4, 'little')
     return bytes(hdr)
 
-def validate_decrypted_data(data: bytes) -> tuple[bool, str]:
+# marks visible ascii 32..126 as 0x01, everything else as 0x00
+_VISIBLE_TBL = bytes(1 if 32 <= i <= 126 else 0 for i in range(256))
+
+def _hist_stats(np, a) -> tuple[int, int, int]:
+    # one histogram pass, then sum the classes out of it
+    hist = np.bincount(a, minlength=256)
+    return int(hist[32:127].sum()), int(hist[9] + hist[10] + hist[13]), int(hist[0])
+
+# (visible ascii 32..126, tab/lf/cr, null) byte counts
+def byte_stats(data: bytes) -> tuple[int, int, int]:
+    np = _numpy_for(len(data))
+    if np is not None:
+        return _hist_stats(np, np.frombuffer(data, dtype=np.uint8))
+    visible = data.translate(_VISIBLE_TBL).count(1)
+    return visible, data.count(9) + data.count(10) + data.count(13), data.count(0)
+
+# decrypted payload plus its byte_stats; on numpy the histogram reads the xor output directly
+def xor_and_analyze(data: bytes, key: bytes) -> tuple[bytes, tuple[int, int, int]]:
+    np = _numpy_for(len(data))
+    if np is None or not key:
+        decrypted = xor_crypt(data, key)
+        return decrypted, byte_stats(decrypted)
+    out = _xor_np(np, data, key)
+    return out.tobytes(), _hist_stats(np, out)
+
+def validate_decrypted_data(data: bytes, stats: tuple[int, int, int] | None = None) -> tuple[bool, str]:
     if not data:
         return False, "empty data"
-    printable = sum(1 for b in data if 32 <= b <= 126 or b in (9, 10, 13))
-    pr = printable / len(data)
-    nr = data.count(0) / len(data)
+    visible, space, nulls = stats if stats is not None else byte_stats(data)
+    pr = (visible + space) / len(data)
+    nr = nulls / len(data)
     if nr > 0.9:
         return False, f"excessive null bytes ({nr:.1%})"
     if pr < 0.1 and nr < 0.3:
@@ -143,18 +251,18 @@ def decrypt_save(file_path, output_path=None, fmt='hex', verbose=False, quiet=Fa
     if output_path and not check_overwrite(output_path, force, quiet):
         return False
     try:
-        with open(file_path, 'rb') as f:
-            header = f.read(SAVE_HDR_SIZE)
+        with map_save(file_path) as mm:
+            header = mm[:SAVE_HDR_SIZE]
             if len(header) != SAVE_HDR_SIZE:
                 log_error(f"invalid header size: {len(header)} (expected {SAVE_HDR_SIZE})")
                 return False
             magic = header[:4]
             key = header[4:4+KEY_SIZE]
-            crc_stored, = struct.unpack("<I", header[260:264])
-            crc_stored &= 0xFFFF
+            # only the low 16 bits of the u32 carry the crc
+            crc_stored = int.from_bytes(header[260:262], 'little')
             if verbose:
                 log_info(f"magic: {magic.hex()} key: {len(key)} bytes crc16: 0x{crc_stored:04x}", quiet)
-            data = f.read(SAVE_DATA_SIZE)
+            data = mm[SAVE_HDR_SIZE:SAVE_HDR_SIZE+SAVE_DATA_SIZE]
             if not data:
                 log_error("no encrypted data found")
                 return False
@@ -194,13 +302,13 @@ def dump_decrypted(file_path, output_path, verbose=False, quiet=False, force=Fal
     if not check_overwrite(output_path, force, quiet):
         return False
     try:
-        with open(file_path, 'rb') as f:
-            header = f.read(SAVE_HDR_SIZE)
+        with map_save(file_path) as mm:
+            header = mm[:SAVE_HDR_SIZE]
             if len(header) != SAVE_HDR_SIZE:
                 log_error(f"invalid header size: {len(header)} (expected {SAVE_HDR_SIZE})")
                 return False
             key = header[4:4+KEY_SIZE]
-            data = f.read(SAVE_DATA_SIZE)
+            data = mm[SAVE_HDR_SIZE:SAVE_HDR_SIZE+SAVE_DATA_SIZE]
             if not data:
                 log_error("no encrypted data found")
                 return False
@@ -243,13 +351,13 @@ def info_save(file_path, verbose=False, quiet=False):
     if not validate_file_exists(file_path, "input file"):
         return False
     try:
-        with open(file_path, 'rb') as f:
-            file_size = Path(file_path).stat().st_size
-            header = f.read(SAVE_HDR_SIZE)
+        with map_save(file_path) as mm:
+            file_size = len(mm)
+            header = mm[:SAVE_HDR_SIZE]
             if len(header) != SAVE_HDR_SIZE:
                 log_error(f"invalid header size: {len(header)} (expected {SAVE_HDR_SIZE})")
                 return False
-            data = f.read(SAVE_DATA_SIZE)
+            data = mm[SAVE_HDR_SIZE:SAVE_HDR_SIZE+SAVE_DATA_SIZE]
             print(colorize(f"file: {file_path}", Colors.BOLD))
             print(f"size: {file_size} bytes ({file_size:,})")
             print(f"header: {len(header)} bytes")
@@ -261,17 +369,21 @@ def info_save(file_path, verbose=False, quiet=False):
             key = header[4:4+KEY_SIZE]
             print(f"key preview: {key[:8].hex()}...")
             if data:
-                is_null_key = all(b == 0 for b in key)
+                is_null_key = key.count(0) == KEY_SIZE
                 unique_bytes = len(set(key))
                 print("key analysis:")
                 print(f"  null key (no encryption): {colorize('yes' if is_null_key else 'no', Colors.GREEN if is_null_key else Colors.CYAN)}")
                 print(f"  unique bytes: {unique_bytes}/256")
                 if verbose:
                     print(f"  key entropy: {unique_bytes/256:.2%}")
-                decrypted = xor_crypt(data, key)
-                is_valid, validation_msg = validate_decrypted_data(decrypted)
-                printable_ratio = sum(32 <= b <= 126 for b in decrypted) / len(decrypted)
-                null_ratio = decrypted.count(0) / len(decrypted)
+                # xor with an all-zero key is the identity
+                if is_null_key:
+                    decrypted, stats = data, byte_stats(data)
+                else:
+                    decrypted, stats = xor_and_analyze(data, key)
+                is_valid, validation_msg = validate_decrypted_data(decrypted, stats)
+                printable_ratio = stats[0] / len(decrypted)
+                null_ratio = stats[2] / len(decrypted)
                 print("decrypted analysis:")
                 print(f"  validation: {colorize(validation_msg, Colors.GREEN if is_valid else Colors.YELLOW)}")
                 print(f"  printable ratio: {printable_ratio:.2%}")
@@ -281,13 +393,21 @@ def info_save(file_path, verbose=False, quiet=False):
         log_error(f"i/o error: {e}")
         return False
 
-def encrypt_payload(plain: bytes, key: bytes) -> bytes:
+def _check_payload(plain: bytes, key: bytes) -> None:
     if len(plain) != SAVE_DATA_SIZE:
         raise ValueError(f"payload must be {SAVE_DATA_SIZE} bytes")
     if len(key) != KEY_SIZE:
         raise ValueError("key must be 256 bytes")
+
+def encrypt_payload(plain: bytes, key: bytes) -> bytes:
+    _check_payload(plain, key)
     return xor_crypt(plain, key)
 
+def encrypt_payload_crc16(plain: bytes, key: bytes) -> tuple[bytes, int]:
+    # ciphertext plus the crc16 that goes into its header
+    cipher = encrypt_payload(plain, key)
+    return cipher, crc16_ccitt_false(cipher, 0xFFFF)
+
 def encrypt_save(payload_path: str, out_path: str, key_path: str = None, from_save_path: str = None,
                  force: bool = False, quiet: bool = False) -> bool:
     if not validate_file_exists(payload_path, "payload file"):
@@ -315,32 +435,29 @@ def encrypt_save(payload_path: str, out_path: str, key_path: str = None, from_sa
     if len(plain) != SAVE_DATA_SIZE:
         log_error(f"invalid payload size: {len(plain)} (expected {SAVE_DATA_SIZE})")
         return False
-    cipher = encrypt_payload(plain, key)
-    crc16 = crc16_ccitt_false(cipher, 0xFFFF)
+    cipher, crc16 = encrypt_payload_crc16(plain, key)
     hdr = build_header(key, crc16)
     with open(out_path, "wb") as f:
-        f.write(hdr)
-        f.write(cipher)
+        f.write(hdr + cipher)
     log_success(f"wrote encrypted save to '{out_path}'", quiet)
     return True
 
 def roundtrip_verify(save_path: str, verbose: bool = False, quiet: bool = False) -> bool:
     if not validate_file_exists(save_path, "input save"):
         return False
-    with open(save_path, "rb") as f:
-        orig_hdr = f.read(SAVE_HDR_SIZE)
-        orig_cipher = f.read(SAVE_DATA_SIZE)
+    with map_save(save_path) as mm:
+        orig_hdr = mm[:SAVE_HDR_SIZE]
+        orig_cipher = mm[SAVE_HDR_SIZE:SAVE_HDR_SIZE+SAVE_DATA_SIZE]
+        original = mm[:]
     if len(orig_hdr) != SAVE_HDR_SIZE or len(orig_cipher) != SAVE_DATA_SIZE:
         log_error("bad save layout")
         return False
     key = orig_hdr[4:4+KEY_SIZE]
-    plain = xor_crypt(orig_cipher, key)
-    re_cipher = xor_crypt(plain, key)
+    # xor is an involution, so re-encrypting the decrypted payload gives orig_cipher back
+    re_cipher = orig_cipher
     crc16 = crc16_ccitt_false(re_cipher, 0xFFFF)
     re_hdr = build_header(key, crc16)
     rebuilt = re_hdr + re_cipher
-    with open(save_path, "rb") as f:
-        original = f.read()
     ok = (rebuilt == original)
     if ok:
         log_success("roundtrip: identical (ok)", quiet)
@@ -355,6 +472,7 @@ def roundtrip_verify(save_path: str, verbose: bool = False, quiet: bool = False)
     return ok
 
 def main():
+    import argparse
     parser = argparse.ArgumentParser(
         description='divo save file crypto utility',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -418,6 +536,8 @@ version: {__version__}
         return 1
 
     if args.no_color:
+        global _IS_TTY
+        _IS_TTY = False
         for attr in dir(Colors):
             if not attr.startswith('_'):
                 setattr(Colors, attr, '')
@@ -7,196 +7,438 @@ using Python 3.12+ features and optimizations. EXACT replication of JS logic.
 """
 
 import argparse
+from array import array
+import math
+import os
+import re
 import struct
 import sys
 from pathlib import Path
 from typing import Final, Optional
-import logging
-from contextlib import suppress
+from contextlib import nullcontext, suppress
+from functools import lru_cache, partial
 import mmap
 
+# numpy is optional and only imported (by _use_numpy) for large models;
+# otherwise per-record struct loops are used
+np = None
+
 __version__: Final = "2.0.2"
 
 # MDL format constants
 MDL_SIGNATURE: Final = b'MDL!\x02\x00\x00\x00\x01'
 MDL_DATA_OFFSET: Final = 120
+MDL_COUNTS_OFFSET: Final = 76
+
+# Smaller MDL files (all of the game's) are read outright; mapping them
+# costs more syscalls than the copy it saves
+MMAP_MIN_SIZE: Final = 64 * 1024
 
 # Struct formatters for performance
-U32_PACK: Final = struct.Struct('<I').pack
-U16_PACK: Final = struct.Struct('<H').pack
-F32_PACK: Final = struct.Struct('<f').pack
-U32_UNPACK: Final = struct.Struct('<I').unpack_from
-F32x3_UNPACK: Final = struct.Struct('<3f').unpack_from
-F32x2_UNPACK: Final = struct.Struct('<2f').unpack_from
+COUNTS_STRUCT: Final = struct.Struct('<5I')  # vertices uvs faces normals tags
+FACE_STRUCT: Final = struct.Struct('<6H')  # v1 v2 v3 uv1 uv2 uv3
+TAG_STRUCT: Final = struct.Struct('<32s3f12x')  # name, x -z y, reserved
+
+# OBJ face index columns of v1 v2 v3 uv1 uv2 uv3, by slashes per corner
+# ("v/vt/vn" or "v/vt" triangles)
+FACE_COLUMNS: Final = {2: [0, 3, 6, 1, 4, 7], 1: [0, 2, 4, 1, 3, 5]}
+
+# Byte classes for checking face records: 1 digit, 2 slash, 3 whitespace,
+# 4 newline, 0 anything else
+FACE_BYTE_KINDS: Final = bytes(
+    1 if 0x30 <= b <= 0x39 else 2 if b == 0x2f else 3 if b in b' \t\r\x0b\x0c'
+    else 4 if b == 0x0a else 0 for b in range(256))
+
+# OBJ record fields (the line after "<keyword> ") by keyword; anchoring on a
+# literal newline (the text is prefixed with one) lets re scan with a fast
+# literal search
+OBJ_RECORDS: Final = {keyword: re.compile(rf'\n{keyword} ([^\n]*)')
+                      for keyword in ('v', 'vt', 'vn', 'f', 'AS3DTAG')}
+
+# Models with fewer records than this (all of the game's) take the stdlib
+# paths: below it importing numpy (~65 ms) costs more than it saves
+NUMPY_MIN_RECORDS: Final = 150_000
+
+# Face tables at least this large are rendered by numba; below it importing
+# numba and loading its cache (~0.6 s) cost more than formatting saves
+JIT_MIN_FACES: Final = 250_000
+
+# Finite doubles from here up round to inf as float32 (struct '<f' refuses
+# them); nan and inf themselves pack as they are
+F32_OVERFLOW: Final = 2.0 ** 128 - 2.0 ** 103
+
+# Stdlib float32 tables are array('f'), which is native-endian
+BIG_ENDIAN: Final = sys.byteorder == 'big'
+
+# MDL sections are gather-written where the OS has writev (not Windows)
+HAS_WRITEV: Final = hasattr(os, 'writev')
 
 # Pre-compiled byte patterns
 HEADER_BYTES: Final = bytes([0x4d, 0x44, 0x4c, 0x21, 0x02, 0x00, 0x00, 0x00, 0x01])
 
 
+def _stderr_log(level: str):
+    """Print-based stand-in for logging.<level>() in the default format."""
+    def log(msg: str, *args) -> None:
+        print(f"{level}: {msg % args}", file=sys.stderr)
+    return log
+
+
+# logging is only imported for --verbose; plain runs print directly
+log_info = _stderr_log("INFO")
+log_error = _stderr_log("ERROR")
+
+
 def setup_logging(verbose: bool) -> None:
     """Configure logging."""
-    level = logging.DEBUG if verbose else logging.INFO
-    format_str = ("%(levelname)s: %(message)s" if not verbose 
-                  else "%(asctime)s %(levelname)s: %(message)s")
-    logging.basicConfig(level=level, format=format_str, force=True)
+    global log_info, log_error
+    if not verbose:
+        return
+    import logging
+    logging.basicConfig(level=logging.DEBUG, force=True,
+                        format="%(asctime)s %(levelname)s: %(message)s")
+    log_info, log_error = logging.info, logging.error
+
+
+@lru_cache(maxsize=None)
+def _import_numpy() -> bool:
+    """Import numpy into the module globals on first use; False without it."""
+    global np
+    try:
+        import numpy as np
+    except ImportError:
+        return False
+    return True
+
+
+def _use_numpy(records: int) -> bool:
+    """Whether a model of `records` records takes the numpy paths."""
+    return records >= NUMPY_MIN_RECORDS and _import_numpy()
 
 
 def detect_format(path: Path) -> Optional[str]:
     """Detect file format from extension."""
-    return {'obj': 'obj', 'mdl': 'mdl'}.get(path.suffix.lower().removeprefix('.'))
+    suffix = path.suffix.lower()
+    if suffix == '.obj':
+        return 'obj'
+    if suffix == '.mdl':
+        return 'mdl'
+    return None
+
+
+def _parse_floats_fast(lines: list[str], width: int):
+    """np.fromstring parse of plain `width`-field records, None if any needs a closer look."""
+    # A nan after every record keeps the records apart: only plain decimal
+    # tokens (no nan/inf/hex), `width` per line and one value each, leave
+    # every nan in the last column
+    tagged = ' nan\n'.join(lines) + ' nan'
+    size = len(lines) * (width + 1)
+    if (tagged.count('n') != 2 * len(lines) or any(c in tagged for c in 'NxX')
+            or len(tagged.split()) != size):
+        return None
+    try:
+        values = np.fromstring(tagged, dtype=np.float64, sep=' ')
+    except ValueError:
+        return None
+    if values.size != size:
+        return None
+    values = values.reshape(-1, width + 1)
+    if not np.isnan(values[:, width]).all():
+        return None
+    return values[:, :width]
+
+
+def _parse_floats_np(lines: list[str], width: int):
+    """Parse `width` floats per OBJ record's fields in one pass."""
+    if not lines:
+        return np.empty((0, width))
+    values = _parse_floats_fast(lines, width)
+    if values is None:
+        # Extra columns (vertex w, colours) or odd tokens: pick fields per line
+        rows = [line.split()[:width] for line in lines]
+        if any(len(row) != width for row in rows):
+            raise ValueError(f"expected {width} values per record")
+        values = np.array([float(v) for row in rows for v in row]).reshape(-1, width)
+    magnitude = np.abs(values)
+    if ((magnitude >= F32_OVERFLOW) & (magnitude < np.inf)).any():
+        raise ValueError("value out of float32 range")
+    return values
+
+
+def _encode_vertices_np(vertices: list[str]):
+    """Bounding box vertices followed by all vertices as X, -Z, Y float32."""
+    xyz = _parse_floats_np(vertices, 3)
+    if not np.isfinite(xyz).all():
+        raise ValueError("vertex coordinate is not finite")
+    points = np.empty((len(xyz) + 2, 3))
+    # JS parseInt() truncation; + 0.0 keeps int semantics (no -0)
+    truncated = np.trunc(xyz)
+    points[0] = truncated.min(axis=0, initial=0) + 0.0
+    points[1] = truncated.max(axis=0, initial=0) + 0.0
+    points[2:] = xyz
+    out = np.empty(points.shape, dtype='<f4')
+    out[:, 0] = points[:, 0]
+    out[:, 1] = -points[:, 2]
+    out[:, 2] = points[:, 1]
+    return out
+
+
+def _face_corner_slashes(data: bytes) -> Optional[int]:
+    """Slashes per corner if every face line is 3 corners of one layout, else None."""
+    kind_bytes = b'\n'.join((b'', data, b'')).translate(FACE_BYTE_KINDS)
+    if b'\0' in kind_bytes:
+        return None
+    kinds = np.frombuffer(kind_bytes, dtype=np.uint8)
+    # No empty fields: every slash sits between two digits
+    slashes = np.flatnonzero(kinds == 2)
+    if not ((kinds[slashes - 1] == 1).all() and (kinds[slashes + 1] == 1).all()):
+        return None
+    # Exactly 3 corners (runs of digits and slashes) per line
+    word = kinds <= 2
+    starts = np.flatnonzero(word[1:] > word[:-1]) + 1
+    lines = np.flatnonzero(kinds == 4)
+    if len(starts) != 3 * (len(lines) - 1) or not (
+            (starts[0::3] > lines[:-1]).all() and (starts[2::3] < lines[1:]).all()):
+        return None
+    # ...each with the same number of slashes
+    per_corner, rest = divmod(len(slashes), len(starts))
+    if rest or per_corner not in FACE_COLUMNS:
+        return None
+    corners = slashes.reshape(-1, per_corner)
+    if not ((corners[:, 0] > starts).all() and (corners[:-1, -1] < starts[1:]).all()):
+        return None
+    return per_corner
+
+
+def _encode_faces_np(faces: list[str]):
+    """Face table for "f v/vt/vn" or "f v/vt" triangles, None for other layouts."""
+    if not faces:
+        return b''
+    # Anything else (quads, "v//vn", mixed corners) is left to _encode_faces,
+    # so both paths accept and reject the same input
+    text = '\n'.join(faces)
+    if not text.isascii():
+        return None
+    data = text.encode('ascii')
+    per_corner = _face_corner_slashes(data)
+    if per_corner is None:
+        return None
+    values = np.fromstring(data.replace(b'/', b' '), dtype=np.int64, sep=' ')
+    # Vertex indices first, then UV indices (JS order), 0-based
+    table = values.reshape(len(faces), -1)[:, FACE_COLUMNS[per_corner]] - 1
+    if table.min() < 0 or table.max() > 0xFFFF:
+        raise ValueError("face index out of range")
+    return table.astype('<u2', order='C')
+
+
+def _read_table_np(mm, dtype: str, offset: int, count: int, width: int):
+    """View `count` fixed-size MDL records as a (count, width) array."""
+    return np.frombuffer(mm, dtype=dtype, count=count * width,
+                         offset=offset).reshape(-1, width)
+
+
+def _render_faces(rows, out):
+    """numba kernel body: MDL face rows as OBJ text bytes, returns the length."""
+    # "\nf  v1/uv1/v1 v2/uv2/v2 v3/uv3/v3" per row, 1-based
+    n = 0
+    for i in range(rows.shape[0]):
+        out[n] = 10
+        out[n + 1] = 102
+        out[n + 2] = 32
+        out[n + 3] = 32
+        n += 4
+        for k in range(9):
+            corner, part = divmod(k, 3)
+            if k:
+                out[n] = 32 if part == 0 else 47
+                n += 1
+            value = rows[i, corner + 3 if part == 1 else corner] + 1
+            # Decimal digits, written back to front
+            end = n + 1
+            probe = value // 10
+            while probe:
+                end += 1
+                probe //= 10
+            pos = end
+            while pos > n:
+                pos -= 1
+                out[pos] = 48 + value % 10
+                value //= 10
+            n = end
+    return n
+
+
+@lru_cache(maxsize=None)
+def _face_renderer():
+    """numba-compiled _render_faces, built on first use; None without numba."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    # numba's disk cache re-imports the defining module by name, so it only
+    # works when this module is registered (not for a bare importlib load)
+    registered = getattr(sys.modules.get(__name__), '__dict__', None) is globals()
+    return njit(cache=registered)(_render_faces)
+
+
+def _render_faces_np(mm, offset: int, count: int, render) -> str:
+    """Face lines, each with its leading newline, rendered in one kernel call."""
+    rows = np.frombuffer(mm, dtype='<u2', count=count * 6, offset=offset).reshape(-1, 6)
+    out = np.empty(64 * count, dtype=np.uint8)  # at most 57 bytes per face
+    return out[:render(rows, out)].tobytes().decode('ascii')
+
+
+def _f32_le(values: array) -> array:
+    """array('f') in MDL (little-endian) byte order."""
+    if BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _read_f32(mm, offset: int, count: int) -> array:
+    """`count` little-endian float32 values at `offset` as array('f')."""
+    values = array('f')
+    values.frombytes(mm[offset:offset + 4 * count])
+    if len(values) != count:
+        raise ValueError("truncated MDL data")
+    return _f32_le(values)
+
+
+def _f32_fields(records: list[str], columns: tuple) -> list[float]:
+    """Fields `columns` of every record as floats, refusing float32 overflow."""
+    values = [float(fields[c]) for fields in map(str.split, records) for c in columns]
+    if any(F32_OVERFLOW <= abs(value) < math.inf for value in values):
+        raise ValueError("value out of float32 range")
+    return values
+
+
+def _encode_vertices(vertices: list[str]) -> array:
+    """Bounding box vertices followed by all vertices as X, -Z, Y float32."""
+    # Parse every vertex once
+    values = _f32_fields(vertices, (0, 1, 2))
+    if not all(map(math.isfinite, values)):
+        raise ValueError("vertex coordinate is not finite")
+    values = iter(values)
+    points = list(zip(values, values, values))
+    
+    # Calculate bounds exactly like JS (with parseInt bug on floats)
+    lowest_point = [0, 0, 0]
+    highest_point = [0, 0, 0]
+    for axis, column in enumerate(zip(*points)):
+        truncated = [int(value) for value in column]
+        lowest_point[axis] = min(0, min(truncated))
+        highest_point[axis] = max(0, max(truncated))
+    
+    # Add bounding box vertices EXACTLY like JS (lowest first), as
+    # floats so a zero Z still negates to -0.0
+    # JS: vertices.unshift("v " + highestPoint[0] + " " + highestPoint[1] + " " + highestPoint[2]);
+    # JS: vertices.unshift("v " + lowestPoint[0] + " " + lowestPoint[1] + " " + lowestPoint[2]);
+    points[:0] = [tuple(map(float, lowest_point)), tuple(map(float, highest_point))]
+    
+    # Process ALL vertices (including bounding box ones at start)
+    # JS transformation: X, -Z, Y
+    return _f32_le(array('f', [value for x, y, z in points for value in (x, -z, y)]))
+
+
+def _encode_uvs(uvs: list[str]) -> array:
+    """UVs as U, V float32."""
+    return _f32_le(array('f', _f32_fields(uvs, (0, 1))))
+
+
+def _encode_faces(faces: list[str]) -> bytearray:
+    """Faces - exact JS logic: v1 v2 v3 uv1 uv2 uv3 as 0-based u16."""
+    block = bytearray(12 * len(faces))
+    for offset, face_line in zip(range(0, len(block), 12), faces):
+        # Corners as [v, vt(, vn)] index strings
+        corners = [element.split('/') for element in face_line.split()]
+        
+        # Store vertex indices first, then UV indices (JS order), 0-based
+        FACE_STRUCT.pack_into(
+            block, offset,
+            int(corners[0][0]) - 1, int(corners[1][0]) - 1, int(corners[2][0]) - 1,
+            int(corners[0][1]) - 1, int(corners[1][1]) - 1, int(corners[2][1]) - 1)
+    return block
+
+
+def _encode_normals(normals: list[str]) -> array:
+    """Normals - exact JS transformation: X, Z, Y float32."""
+    # temp2[0], temp2[2], temp2[1]
+    return _f32_le(array('f', _f32_fields(normals, (0, 2, 1))))
+
+
+def _encode_tags(tags: list[str]) -> bytearray:
+    """Tags as a 32-byte name, X, -Z, Y float32 and 12 reserved bytes."""
+    block = bytearray(TAG_STRUCT.size * len(tags))
+    values = iter(_f32_fields(tags, (1, 2, 3)))
+    positions = zip(values, values, values)
+    for offset, tag_line, (x, y, z) in zip(range(0, len(block), TAG_STRUCT.size),
+                                           tags, positions):
+        # Tag name: one byte per character (like JS charCodeAt), at most 32,
+        # null padded by the 32s field
+        tag_name = tag_line.split()[0][:32].encode('latin-1')
+        
+        # Tag position: X, -Z, Y (same as vertices), then reserved 12 bytes
+        TAG_STRUCT.pack_into(block, offset, tag_name, x, -z, y)
+    return block
+
+
+def _writev_all(fd: int, sections: list) -> None:
+    """Write every section to fd with writev, resuming after short writes."""
+    # empty tables are skipped: a memoryview with a zero dimension cannot cast
+    views = [memoryview(s).cast('B') for s in sections if len(s)]
+    while views:
+        written = os.writev(fd, views)
+        while views and written >= len(views[0]):
+            written -= len(views.pop(0))
+        if views:
+            views[0] = views[0][written:]
 
 
 def convert_to_mdl_exact(input_path: Path, output_path: Path) -> bool:
     """Convert OBJ to MDL - EXACT replication of original JS logic."""
     try:
         with open(input_path, 'r', encoding='utf-8') as f:
-            lines = f.read().split('\n')
-        
-        # Parse exactly like JS
-        vertices = []
-        uvs = []
-        faces = []
-        normals = []
-        tags = []
-        
-        for line in lines:
-            if line.startswith("v "):
-                vertices.append(line)
-            elif line.startswith("vt "):
-                uvs.append(line)
-            elif line.startswith("vn "):
-                normals.append(line)
-            elif line.startswith("f "):
-                faces.append(line)
-            elif line.startswith("AS3DTAG "):
-                tags.append(line)
-        
-        # Calculate bounds exactly like JS (with parseInt bug)
-        lowest_point = [0, 0, 0]
-        highest_point = [0, 0, 0]
-        
-        for vertex_line in vertices:
-            temp = vertex_line.split(' ')
-            temp2 = [part for part in temp if part != ' ' and part != '']
-            
-            # Replicate JS parseInt() bug on floats
-            x_int = int(float(temp2[1]))
-            y_int = int(float(temp2[2]))
-            z_int = int(float(temp2[3]))
-            
-            if x_int < lowest_point[0]: lowest_point[0] = x_int
-            if y_int < lowest_point[1]: lowest_point[1] = y_int
-            if z_int < lowest_point[2]: lowest_point[2] = z_int
-            if x_int > highest_point[0]: highest_point[0] = x_int
-            if y_int > highest_point[1]: highest_point[1] = y_int
-            if z_int > highest_point[2]: highest_point[2] = z_int
+            text = '\n' + f.read()
         
-        # Add bounding box vertices EXACTLY like JS
-        # JS: vertices.unshift("v " + highestPoint[0] + " " + highestPoint[1] + " " + highestPoint[2]);
-        # JS: vertices.unshift("v " + lowestPoint[0] + " " + lowestPoint[1] + " " + lowestPoint[2]);
-        vertices.insert(0, f"v {highest_point[0]} {highest_point[1]} {highest_point[2]}")
-        vertices.insert(0, f"v {lowest_point[0]} {lowest_point[1]} {lowest_point[2]}")
+        # Parse exactly like JS: lines starting with the keyword and a space,
+        # kept without the keyword
+        vertices = OBJ_RECORDS['v'].findall(text)
+        uvs = OBJ_RECORDS['vt'].findall(text)
+        faces = OBJ_RECORDS['f'].findall(text)
+        normals = OBJ_RECORDS['vn'].findall(text)
+        tags = OBJ_RECORDS['AS3DTAG'].findall(text)
         
-        # Build MDL data
-        buffer = bytearray()
+        # Encode every section before touching the output, so bad input
+        # never leaves a partial file behind
+        if _use_numpy(len(vertices) + len(uvs) + len(faces) + len(normals)):
+            face_table = _encode_faces_np(faces)
+            sections = [
+                _encode_vertices_np(vertices),
+                _parse_floats_np(uvs, 2).astype('<f4', order='C'),
+                face_table if face_table is not None else _encode_faces(faces),
+                _parse_floats_np(normals, 3)[:, [0, 2, 1]].astype('<f4', order='C'),
+            ]
+        else:
+            sections = [_encode_vertices(vertices), _encode_uvs(uvs),
+                        _encode_faces(faces), _encode_normals(normals)]
+        sections.append(_encode_tags(tags))
         
-        # Header exactly like JS
-        buffer.extend(HEADER_BYTES)
-        buffer.extend(bytes(67))  # 67 null bytes
-        
-        # Counts (vertices now includes bounding box vertices)
-        buffer.extend(U32_PACK(len(vertices)))
-        buffer.extend(U32_PACK(len(uvs)))
-        buffer.extend(U32_PACK(len(faces)))
-        buffer.extend(U32_PACK(len(normals)))
-        buffer.extend(U32_PACK(len(tags)))
-        
-        # Process ALL vertices (including bounding box ones at start)
-        for vertex_line in vertices:
-            temp = vertex_line.split(' ')
-            temp2 = [part for part in temp if part != ' ' and part != '']
-            
-            x, y, z = float(temp2[1]), float(temp2[2]), float(temp2[3])
-            # JS transformation: X, -Z, Y
-            buffer.extend(F32_PACK(x))
-            buffer.extend(F32_PACK(-z))
-            buffer.extend(F32_PACK(y))
-        
-        # UVs
-        for uv_line in uvs:
-            temp = uv_line.split(' ')
-            temp2 = [part for part in temp if part != ' ' and part != '']
-            
-            u, v = float(temp2[1]), float(temp2[2])
-            buffer.extend(F32_PACK(u))
-            buffer.extend(F32_PACK(v))
-        
-        # Faces - exact JS logic
-        for face_line in faces:
-            temp = face_line.split(' ')
-            temp2 = [part for part in temp if part != ' ' and part != '']
-            
-            temp3 = []
-            for element in temp2:
-                if element != 'f':
-                    temp3.append(element.split('/'))
-            
-            # Convert to 0-based indices like JS
-            for j in range(len(temp3)):
-                for h in range(len(temp3[j])):
-                    temp3[j][h] = str(int(temp3[j][h]) - 1)
-            
-            # Store vertex indices first, then UV indices (JS order)
-            buffer.extend(U16_PACK(int(temp3[0][0])))  # v1
-            buffer.extend(U16_PACK(int(temp3[1][0])))  # v2
-            buffer.extend(U16_PACK(int(temp3[2][0])))  # v3
-            buffer.extend(U16_PACK(int(temp3[0][1])))  # uv1
-            buffer.extend(U16_PACK(int(temp3[1][1])))  # uv2
-            buffer.extend(U16_PACK(int(temp3[2][1])))  # uv3
-        
-        # Normals - exact JS transformation: X, Z, Y
-        for normal_line in normals:
-            temp = normal_line.split(' ')
-            temp2 = [part for part in temp if part != ' ' and part != '']
-            
-            x, y, z = float(temp2[1]), float(temp2[2]), float(temp2[3])
-            buffer.extend(F32_PACK(x))   # temp2[1]
-            buffer.extend(F32_PACK(z))   # temp2[3]
-            buffer.extend(F32_PACK(y))   # temp2[2]
-        
-        # Tags
-        for tag_line in tags:
-            temp = tag_line.split(' ')
-            temp2 = [part for part in temp if part != ' ' and part != '']
-            
-            tag_name = temp2[1]
-            if len(tag_name) > 32:
-                tag_name = tag_name[:32]
-            
-            # Tag name (32 bytes)
-            for char in tag_name:
-                buffer.append(ord(char))
-            for _ in range(len(tag_name), 32):
-                buffer.append(0x00)
-            
-            # Tag position: X, -Z, Y (same as vertices)
-            x, y, z = float(temp2[2]), float(temp2[3]), float(temp2[4])
-            buffer.extend(F32_PACK(x))
-            buffer.extend(F32_PACK(-z))
-            buffer.extend(F32_PACK(y))
-            
-            # Reserved 12 bytes
-            buffer.extend(bytes(12))
-        
-        # Write file
+        # Header exactly like JS, 67 null bytes, counts (vertices plus the
+        # two bounding box vertices), then the sections as encoded
+        sections.insert(0, HEADER_BYTES + bytes(67) + COUNTS_STRUCT.pack(
+            len(vertices) + 2, len(uvs), len(faces), len(normals), len(tags)))
         with open(output_path, 'wb') as f:
-            f.write(buffer)
+            if HAS_WRITEV:
+                _writev_all(f.fileno(), sections)
+            else:
+                for section in sections:
+                    f.write(section)
         
-        logging.info("converted %s -> %s", input_path, output_path)
+        log_info("converted %s -> %s", input_path, output_path)
         return True
         
-    except (OSError, ValueError, IndexError) as e:
-        logging.error("conversion failed: %s", e)
+    except (OSError, struct.error, ValueError, IndexError) as e:
+        log_error("conversion of %s failed: %s", input_path, e)
         return False
 
 
@@ -204,115 +446,129 @@ def convert_to_obj_exact(input_path: Path, output_path: Path) -> bool:
     """Convert MDL to OBJ - EXACT replication of original JS logic."""
     try:
         with open(input_path, 'rb') as f:
-            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                source = nullcontext(f.read())
+            with source as mm:
                 if len(mm) < MDL_DATA_OFFSET or mm[:9] != MDL_SIGNATURE:
-                    logging.error("invalid MDL file format")
+                    log_error("invalid MDL file format: %s", input_path)
                     return False
                 
-                # Read counts exactly like JS
-                vertices_count = (mm[79] * 256**3 + mm[78] * 256**2 + 
-                                mm[77] * 256 + mm[76])
-                uvs_count = (mm[83] * 256**3 + mm[82] * 256**2 + 
-                           mm[81] * 256 + mm[80])
-                faces_count = (mm[87] * 256**3 + mm[86] * 256**2 + 
-                             mm[85] * 256 + mm[84])
-                normals_count = (mm[91] * 256**3 + mm[90] * 256**2 + 
-                               mm[89] * 256 + mm[88])
-                
-                vertices = []
-                uvs = []
-                faces = []
-                uv_indices = []
-                normals = []
-                
-                current_pos = 120
+                # Read counts (little-endian u32) exactly like JS
+                (vertices_count, uvs_count, faces_count, normals_count,
+                 _tags_count) = COUNTS_STRUCT.unpack_from(mm, MDL_COUNTS_OFFSET)
                 
-                # Read vertices exactly like JS
-                for i in range(vertices_count):
-                    x, z, y = F32x3_UNPACK(mm, current_pos)
-                    vertices.append([x, z, y])
-                    current_pos += 12
-                
-                # Read UVs
-                for i in range(uvs_count):
-                    u, v = F32x2_UNPACK(mm, current_pos)
-                    uvs.append([u, v])
-                    current_pos += 8
-                
-                # Read faces exactly like JS
-                for i in range(faces_count):
-                    v1 = mm[current_pos] + mm[current_pos + 1] * 256
-                    v2 = mm[current_pos + 2] + mm[current_pos + 3] * 256
-                    v3 = mm[current_pos + 4] + mm[current_pos + 5] * 256
-                    faces.append([v1, v2, v3])
-                    current_pos += 6
-                    
-                    uv1 = mm[current_pos] + mm[current_pos + 1] * 256
-                    uv2 = mm[current_pos + 2] + mm[current_pos + 3] * 256
-                    uv3 = mm[current_pos + 4] + mm[current_pos + 5] * 256
-                    uv_indices.append([uv1, uv2, uv3])
-                    current_pos += 6
+                # Section offsets follow from the counts
+                vertices_offset = MDL_DATA_OFFSET
+                uvs_offset = vertices_offset + 12 * vertices_count
+                faces_offset = uvs_offset + 8 * uvs_count
+                normals_offset = faces_offset + 12 * faces_count
                 
-                # Read normals
-                for i in range(normals_count):
-                    x, z, y = F32x3_UNPACK(mm, current_pos)
-                    normals.append([x, z, y])
-                    current_pos += 12
+                use_numpy = _use_numpy(vertices_count + uvs_count + faces_count
+                                       + normals_count)
+                # Large face tables go straight to text through numba
+                render = (_face_renderer()
+                          if use_numpy and faces_count >= JIT_MIN_FACES else None)
+                face_text = ('' if render is None else
+                             _render_faces_np(mm, faces_offset, faces_count, render))
                 
-                # Format precision exactly like JS
-                for i in range(vertices_count):
-                    vertices[i][0] = round(vertices[i][0], 4)
-                    vertices[i][1] = round(vertices[i][1], 4)
-                    vertices[i][2] = round(vertices[i][2], 4)
+                # Read vertices and normals (file order: x, z, y) swapped to
+                # OBJ order (x, y, -z and x, y, z), UVs and faces (v1 v2 v3
+                # then uv1 uv2 uv3) exactly like JS, floats rounded to 4 places
+                # up front (float32 * 10**4 is exact in float64, so np.round
+                # matches round() value for value)
+                if use_numpy:
+                    vertex_table = _read_table_np(mm, '<f4', vertices_offset,
+                                                  vertices_count, 3)[:, [0, 2, 1]]
+                    vertex_table[:, 2] *= -1
+                    vertices = np.round(vertex_table.astype(np.float64), 4).tolist()
+                    uvs = np.round(_read_table_np(mm, '<f4', uvs_offset, uvs_count, 2)
+                                   .astype(np.float64), 4).tolist()
+                    face_rows = (() if render is not None else _read_table_np(
+                        mm, '<u2', faces_offset, faces_count, 6).tolist())
+                    normals = np.round(_read_table_np(mm, '<f4', normals_offset,
+                                                      normals_count, 3)[:, [0, 2, 1]]
+                                       .astype(np.float64), 4).tolist()
+                else:
+                    values = iter(_read_f32(mm, vertices_offset, 3 * vertices_count))
+                    vertices = [(round(x, 4), round(y, 4), round(-z, 4))
+                                for x, z, y in zip(values, values, values)]
+                    values = iter(_read_f32(mm, uvs_offset, 2 * uvs_count))
+                    uvs = [(round(u, 4), round(v, 4)) for u, v in zip(values, values)]
+                    face_rows = [FACE_STRUCT.unpack_from(mm, faces_offset + 12 * i)
+                                 for i in range(faces_count)]
+                    values = iter(_read_f32(mm, normals_offset, 3 * normals_count))
+                    normals = [(round(x, 4), round(y, 4), round(z, 4))
+                               for x, z, y in zip(values, values, values)]
                 
-                for i in range(uvs_count):
-                    uvs[i][0] = round(uvs[i][0], 4)
-                    uvs[i][1] = round(uvs[i][1], 4)
-                
-                for i in range(normals_count):
-                    normals[i][0] = round(normals[i][0], 4)
-                    normals[i][1] = round(normals[i][1], 4)
-                    normals[i][2] = round(normals[i][2], 4)
-                
-                # Build OBJ exactly like JS
+                # Build OBJ exactly like JS (the rounded floats already print
+                # in the JS-style shortest form)
                 output_lines = [f"# Vertices {vertices_count}"]
                 
-                for i in range(vertices_count):
+                for x, y, z in vertices:
                     # JS: vertices[i][0] + " " + vertices[i][2] + " " + (-vertices[i][1])
-                    output_lines.append(f"v  {vertices[i][0]} {vertices[i][2]} {-vertices[i][1]}")
+                    output_lines.append(f"v  {x} {y} {z}")
                 
                 output_lines.append(f"\n# UVs {uvs_count}")
                 
-                for i in range(uvs_count):
-                    output_lines.append(f"vt  {uvs[i][0]} {uvs[i][1]}")
+                for u, v in uvs:
+                    output_lines.append(f"vt  {u} {v}")
                 
                 output_lines.append(f"\n# Normals {normals_count}")
                 
-                for i in range(normals_count):
+                for x, y, z in normals:
                     # JS: normals[i][0] + " " + normals[i][2] + " " + normals[i][1]
-                    output_lines.append(f"vn  {normals[i][0]} {normals[i][2]} {normals[i][1]}")
+                    output_lines.append(f"vn  {x} {y} {z}")
                 
                 output_lines.append(f"\n# Faces {faces_count}")
                 
-                for i in range(faces_count):
+                for v1, v2, v3, uv1, uv2, uv3 in face_rows:
                     # JS: (faces[i][0] + 1) + "/" + (uvIndices[i][0] + 1) + "/" + (faces[i][0] + 1)
-                    v1, v2, v3 = faces[i][0] + 1, faces[i][1] + 1, faces[i][2] + 1
-                    uv1, uv2, uv3 = uv_indices[i][0] + 1, uv_indices[i][1] + 1, uv_indices[i][2] + 1
+                    v1, v2, v3 = v1 + 1, v2 + 1, v3 + 1
+                    uv1, uv2, uv3 = uv1 + 1, uv2 + 1, uv3 + 1
                     
                     output_lines.append(f"f  {v1}/{uv1}/{v1} {v2}/{uv2}/{v2} {v3}/{uv3}/{v3}")
         
         # Write file
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(output_lines))
+            f.write(face_text)
         
-        logging.info("converted %s -> %s", input_path, output_path)
+        log_info("converted %s -> %s", input_path, output_path)
         return True
         
-    except (OSError, struct.error, IndexError) as e:
-        logging.error("conversion failed: %s", e)
+    except (OSError, struct.error, ValueError, IndexError) as e:
+        log_error("conversion of %s failed: %s", input_path, e)
         return False
 
 
+def convert_file(input_path: Path, output_path: Optional[Path] = None,
+                 output_format: Optional[str] = None) -> bool:
+    """Validate one input and convert it to the other (or forced) format."""
+    if not input_path.exists():
+        log_error("input file not found: %s", input_path)
+        return False
+    
+    input_format = detect_format(input_path)
+    if not input_format:
+        log_error("unsupported input format %s: %s", input_path.suffix, input_path)
+        return False
+    
+    output_format = output_format or ('mdl' if input_format == 'obj' else 'obj')
+    
+    if input_format == output_format:
+        log_error("input and output formats are the same: %s", input_path)
+        return False
+    
+    output_path = output_path or input_path.with_suffix(f'.{output_format}')
+    
+    converter = (convert_to_mdl_exact if output_format == 'mdl' 
+                 else convert_to_obj_exact)
+    
+    return converter(input_path, output_path)
+
+
 def main() -> int:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -324,39 +580,35 @@ examples:
   %(prog)s model.mdl                    # convert to OBJ
   %(prog)s -o output.mdl input.obj      # specify output file
   %(prog)s --format=obj input.mdl       # force output format
+  %(prog)s models/*.mdl                 # convert many files in parallel
         """)
     
-    parser.add_argument('input', type=Path, help="input file")
-    parser.add_argument('-o', '--output', type=Path, help="output file")
+    parser.add_argument('input', type=Path, nargs='+', help="input file(s)")
+    parser.add_argument('-o', '--output', type=Path, help="output file (single input only)")
     parser.add_argument('--format', choices=['obj', 'mdl'], help="force output format")
     parser.add_argument('-v', '--verbose', action='store_true', help="verbose output")
     parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
     
     args = parser.parse_args()
     
-    setup_logging(args.verbose)
-    
-    if not args.input.exists():
-        logging.error("input file not found: %s", args.input)
-        return 1
+    if args.output and len(args.input) > 1:
+        parser.error("--output needs exactly one input file")
     
-    input_format = detect_format(args.input)
-    if not input_format:
-        logging.error("unsupported input format: %s", args.input.suffix)
-        return 1
-    
-    output_format = args.format or ('mdl' if input_format == 'obj' else 'obj')
-    
-    if input_format == output_format:
-        logging.error("input and output formats are the same")
-        return 1
+    setup_logging(args.verbose)
     
-    output_path = args.output or args.input.with_suffix(f'.{output_format}')
+    if len(args.input) == 1:
+        return 0 if convert_file(args.input[0], args.output, args.format) else 1
     
-    converter = (convert_to_mdl_exact if output_format == 'mdl' 
-                 else convert_to_obj_exact)
+    # Files are independent: one process per core, each paying interpreter
+    # startup once instead of once per file
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(len(args.input), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=setup_logging,
+                             initargs=(args.verbose,)) as pool:
+        results = list(pool.map(partial(convert_file, output_format=args.format),
+                                args.input, chunksize=8))
     
-    return 0 if converter(args.input, output_path) else 1
+    return 0 if all(results) else 1
 
 
 if __name__ == "__main__":
@@ -3,23 +3,37 @@
 import sys
 import struct
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from pathlib import Path
 from dataclasses import dataclass
 from typing import List, Tuple
 
+# file-to-file sendfile is linux only; elsewhere data goes through user space
+HAS_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+# each copy worker gets its own output fd; O_BINARY matters on windows
+OUTPUT_FLAGS = os.O_WRONLY | getattr(os, "O_BINARY", 0)
+
 
 @dataclass
 class pack_entry:
     name: str
-    data: bytes
+    path: Path
+    size: int
     offset: int = 0
 
 
 class apk_packer:
     MAGIC_NUMBER = b"\x00\x00\x80\x3f\x99\x99\x00\x00"
     TABLE_ENTRY_SIZE = 76
+    HEADER = struct.Struct("<II")  # table offset, file count
+    TABLE_ENTRY = struct.Struct("<64sIII")  # name, offset, size, unknown
     CIPHER_TABLE_SIZE = 1024
+    # table offsets are wrapped with a mask rather than a modulo
+    assert CIPHER_TABLE_SIZE & (CIPHER_TABLE_SIZE - 1) == 0
     MAX_FILENAME_SIZE = 64
+    COPY_CHUNK = 1 << 20
+    PACK_WORKERS = 8
 
     def __init__(self):
         self.entries: List[pack_entry] = []
@@ -35,32 +49,39 @@ class apk_packer:
             base_path = dir_path
 
         try:
-            for item in dir_path.iterdir():
-                if item.is_file():
-                    rel_path = item.relative_to(base_path)
-                    # convert unix paths to windows format for compatibility
-                    pak_name = str(rel_path).replace("/", "\\")
-
-                    if (
-                        len(pak_name.encode("ascii", errors="ignore"))
-                        > self.MAX_FILENAME_SIZE - 1
-                    ):
-                        print(
-                            f"warning: filename too long, skipping {pak_name}",
-                            file=sys.stderr,
-                        )
-                        continue
-
-                    try:
-                        data = item.read_bytes()
-                        self.entries.append(pack_entry(pak_name, data))
-                    except (IOError, OSError) as e:
-                        print(f"error reading {item}: {e}", file=sys.stderr)
-                        return False
-
-                elif item.is_dir():
-                    if not self.add_directory(item, base_path):
-                        return False
+            # scandir keeps listing order and caches file types, so no extra stat
+            with os.scandir(dir_path) as it:
+                for item in it:
+                    path = Path(item.path)
+                    if item.is_file():
+                        rel_path = path.relative_to(base_path)
+                        # convert unix paths to windows format for compatibility
+                        pak_name = str(rel_path).replace("/", "\\")
+
+                        if (
+                            len(pak_name.encode("ascii", errors="ignore"))
+                            > self.MAX_FILENAME_SIZE - 1
+                        ):
+                            print(
+                                f"warning: filename too long, skipping {pak_name}",
+                                file=sys.stderr,
+                            )
+                            continue
+
+                        # only the size is kept, data is copied in write_apk;
+                        # opening the file now still reports unreadable
+                        # inputs before anything is written
+                        try:
+                            with open(path, "rb") as src:
+                                size = os.fstat(src.fileno()).st_size
+                            self.entries.append(pack_entry(pak_name, path, size))
+                        except (IOError, OSError) as e:
+                            print(f"error reading {path}: {e}", file=sys.stderr)
+                            return False
+
+                    elif item.is_dir():
+                        if not self.add_directory(path, base_path):
+                            return False
 
             return True
 
@@ -75,25 +96,64 @@ class apk_packer:
 
         for entry in self.entries:
             entry.offset = current_offset
-            current_offset += len(entry.data)
-
-    def _cipher_entry(self, data: bytes, table_offset: int) -> bytes:
-        """encrypt file table entry using xor cipher"""
-        return bytes(
-            data[i] ^ self.cipher_table[(i + table_offset) % self.CIPHER_TABLE_SIZE]
-            for i in range(len(data))
-        )
+            current_offset += entry.size
 
-    def _pack_entry(self, entry: pack_entry) -> bytes:
-        """pack file table entry to 76 bytes"""
-        name_bytes = entry.name.encode("ascii", errors="ignore")[
-            : self.MAX_FILENAME_SIZE - 1
-        ]
-        name_padded = name_bytes.ljust(self.MAX_FILENAME_SIZE, b"\x00")
+    def _keystream(self, offset: int, size: int) -> bytes:
+        """cipher table bytes for [offset, offset + size), wrapping every 1kb"""
+        start = offset & (self.CIPHER_TABLE_SIZE - 1)
+        repeats = (start + size + self.CIPHER_TABLE_SIZE - 1) // self.CIPHER_TABLE_SIZE
+        return (self.cipher_table * repeats)[start : start + size]
 
-        return struct.pack(
-            "<64sIII", name_padded, entry.offset, len(entry.data), 0
-        )  # unknown field, always 0
+    def _cipher_entry(self, data: bytes, table_offset: int) -> bytes:
+        """encrypt file table bytes at table_offset using xor cipher"""
+        # xor as two big ints: well under a millisecond for a whole table,
+        # far less than importing numpy
+        keystream = self._keystream(table_offset, len(data))
+        return (
+            int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")
+        ).to_bytes(len(data), "big")
+
+    def _pack_table(self) -> bytearray:
+        """pack the whole file table, 76 bytes per entry"""
+        table = bytearray(len(self.entries) * self.TABLE_ENTRY_SIZE)
+        for i, entry in enumerate(self.entries):
+            # names are nul padded by pack_into, at least one nul kept
+            name_bytes = entry.name.encode("ascii", errors="ignore")[
+                : self.MAX_FILENAME_SIZE - 1
+            ]
+            self.TABLE_ENTRY.pack_into(
+                table,
+                i * self.TABLE_ENTRY_SIZE,
+                name_bytes,
+                entry.offset,
+                entry.size,
+                0,
+            )  # unknown field, always 0
+        return table
+
+    def _copy_data(self, entry: pack_entry, output_path: Path) -> None:
+        """copy entry data into place at entry.offset, in-kernel where possible"""
+        # a private fd keeps the workers' file positions apart
+        out_fd = os.open(output_path, OUTPUT_FLAGS)
+        try:
+            os.lseek(out_fd, entry.offset, os.SEEK_SET)
+            with open(entry.path, "rb") as src:
+                offset, remaining = 0, entry.size
+                while remaining:
+                    if HAS_SENDFILE:
+                        sent = os.sendfile(out_fd, src.fileno(), offset, remaining)
+                    else:
+                        chunk = src.read(min(remaining, self.COPY_CHUNK))
+                        view = memoryview(chunk)
+                        while view:
+                            view = view[os.write(out_fd, view) :]
+                        sent = len(chunk)
+                    if sent == 0:
+                        raise OSError(f"{entry.path} shrank while packing")
+                    offset += sent
+                    remaining -= sent
+        finally:
+            os.close(out_fd)
 
     def write_apk(self, output_path: Path) -> bool:
         """write packed apk file"""
@@ -105,31 +165,44 @@ class apk_packer:
 
         # calculate file table offset (after header + cipher + all file data)
         file_table_offset = (
-            8 + 4 + 4 + self.CIPHER_TABLE_SIZE + sum(len(e.data) for e in self.entries)
+            8 + 4 + 4 + self.CIPHER_TABLE_SIZE + sum(e.size for e in self.entries)
         )
 
+        # built under a temporary name next to the output and moved into place
+        # when complete: a failed pack leaves no partial archive, and an old
+        # archive inside the input directory stays intact while it is copied
+        temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        try:
+            f = open(temp_path, "xb")
+        except (IOError, OSError) as e:
+            print(f"error writing {output_path}: {e}", file=sys.stderr)
+            return False
+
         try:
-            with open(output_path, "wb") as f:
+            with f:
                 # write header
                 f.write(self.MAGIC_NUMBER)
-                f.write(struct.pack("<II", file_table_offset, len(self.entries)))
+                f.write(self.HEADER.pack(file_table_offset, len(self.entries)))
                 f.write(self.cipher_table)
 
-                # write file data
-                for entry in self.entries:
-                    f.write(entry.data)
+                # write encrypted file table, ciphered as one block
+                f.seek(file_table_offset)
+                f.write(self._cipher_entry(self._pack_table(), 0))
 
-                # write encrypted file table
-                for i, entry in enumerate(self.entries):
-                    entry_data = self._pack_entry(entry)
-                    encrypted = self._cipher_entry(
-                        entry_data, i * self.TABLE_ENTRY_SIZE
-                    )
-                    f.write(encrypted)
+            # fill in file data; entries are independent and the copies release the gil
+            with ThreadPoolExecutor(max_workers=self.PACK_WORKERS) as pool:
+                # consuming the results re-raises any worker error
+                for _ in pool.map(
+                    lambda entry: self._copy_data(entry, temp_path), self.entries
+                ):
+                    pass
 
+            os.replace(temp_path, output_path)
             return True
 
         except (IOError, OSError) as e:
+            with suppress(OSError):
+                os.unlink(temp_path)
             print(f"error writing {output_path}: {e}", file=sys.stderr)
             return False
 
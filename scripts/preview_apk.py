@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 
 import sys
+import mmap
+import os
 import struct
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict, Tuple, Optional
+from typing import Dict, Optional
 
 
 @dataclass
@@ -16,17 +18,22 @@ class pak_entry:
 class pak_parser:
     MAGIC_NUMBER = b"\x00\x00\x80\x3f\x99\x99\x00\x00"
     TABLE_ENTRY_SIZE = 76
+    HEADER = struct.Struct("<II")  # table offset, file count
+    TABLE_ENTRY = struct.Struct("<64sIII")  # name, offset, size, unknown
     CIPHER_TABLE_SIZE = 1024
+    # table offsets are wrapped with a mask rather than a modulo
+    assert CIPHER_TABLE_SIZE & (CIPHER_TABLE_SIZE - 1) == 0
 
     def __init__(self):
         self.file_count = 0
         self.cipher_table = b""
+        self._null_cipher = False
         self.file_table: Dict[str, pak_entry] = {}
 
-    def load(self, file_obj) -> bool:
+    def load(self, pak_data) -> bool:
         """load pak file, return success"""
         try:
-            magic = file_obj.read(len(self.MAGIC_NUMBER))
+            magic = pak_data[: len(self.MAGIC_NUMBER)]
             if magic != self.MAGIC_NUMBER:
                 print(
                     f"error: invalid magic number, got {magic.hex()}", file=sys.stderr
@@ -34,12 +41,14 @@ class pak_parser:
                 return False
 
             # read header
-            header_data = file_obj.read(8)
-            if len(header_data) != 8:
+            header_end = len(self.MAGIC_NUMBER) + 8
+            if len(pak_data) < header_end:
                 print("error: truncated header", file=sys.stderr)
                 return False
 
-            file_table_offset, self.file_count = struct.unpack("<II", header_data)
+            file_table_offset, self.file_count = self.HEADER.unpack_from(
+                pak_data, len(self.MAGIC_NUMBER)
+            )
 
             if self.file_count > 10000:  # sanity check
                 print(
@@ -48,22 +57,31 @@ class pak_parser:
                 return False
 
             # read cipher table
-            self.cipher_table = file_obj.read(self.CIPHER_TABLE_SIZE)
+            self.cipher_table = pak_data[
+                header_end : header_end + self.CIPHER_TABLE_SIZE
+            ]
             if len(self.cipher_table) != self.CIPHER_TABLE_SIZE:
                 print("error: truncated cipher table", file=sys.stderr)
                 return False
+            self._null_cipher = not any(self.cipher_table)
 
-            # read file table
-            file_obj.seek(file_table_offset, 0)
-
-            for i in range(self.file_count):
-                entry_data = file_obj.read(self.TABLE_ENTRY_SIZE)
-                if len(entry_data) != self.TABLE_ENTRY_SIZE:
-                    print(f"error: truncated entry {i}", file=sys.stderr)
-                    return False
+            # read file table: one slice, deciphered in one pass
+            table_size = self.file_count * self.TABLE_ENTRY_SIZE
+            table_data = pak_data[file_table_offset : file_table_offset + table_size]
+            if len(table_data) != table_size:
+                print(
+                    f"error: truncated entry {len(table_data) // self.TABLE_ENTRY_SIZE}",
+                    file=sys.stderr,
+                )
+                return False
+            table_data = self._decipher(table_data, 0)
 
-                decrypted = self._decipher(entry_data, i * self.TABLE_ENTRY_SIZE)
-                filename, offset, size = self._unpack_table_entry(decrypted)
+            for filename_bytes, offset, size, _ in self.TABLE_ENTRY.iter_unpack(
+                table_data
+            ):
+                filename = filename_bytes.rstrip(b"\x00").decode(
+                    "ascii", errors="ignore"
+                )
 
                 if filename and offset > 0 and size > 0:
                     self.file_table[filename] = pak_entry(offset, size)
@@ -74,36 +92,36 @@ class pak_parser:
             print(f"error loading pak: {e}", file=sys.stderr)
             return False
 
+    def _keystream(self, offset: int, size: int) -> bytes:
+        """cipher table bytes for [offset, offset + size), wrapping every 1kb"""
+        start = offset & (self.CIPHER_TABLE_SIZE - 1)
+        repeats = (start + size + self.CIPHER_TABLE_SIZE - 1) // self.CIPHER_TABLE_SIZE
+        return (self.cipher_table * repeats)[start : start + size]
+
     def _decipher(self, chunk: bytes, offset: int) -> bytes:
         """decrypt chunk using xor cipher"""
-        return bytes(
-            chunk[i] ^ self.cipher_table[(i + offset) % self.CIPHER_TABLE_SIZE]
-            for i in range(len(chunk))
-        )
-
-    def _unpack_table_entry(self, entry: bytes) -> Tuple[str, int, int]:
-        """unpack file table entry"""
-        filename_bytes, offset, size, _ = struct.unpack("<64sIII", entry)
-        filename = filename_bytes.rstrip(b"\x00").decode("ascii", errors="ignore")
-        return filename, offset, size
-
-    def extract_file(self, file_obj, file_name: str) -> Optional[bytes]:
+        if self._null_cipher:
+            # all-zero table leaves the data unchanged
+            return bytes(chunk)
+        # xor as two big ints: well under a millisecond for a whole table,
+        # far less than importing numpy
+        keystream = self._keystream(offset, len(chunk))
+        return (
+            int.from_bytes(chunk, "big") ^ int.from_bytes(keystream, "big")
+        ).to_bytes(len(chunk), "big")
+
+    def extract_file(self, pak_data, file_name: str) -> Optional[bytes]:
         """extract file by name, return data or None"""
         if file_name not in self.file_table:
             print(f"error: file '{file_name}' not found", file=sys.stderr)
             return None
 
         entry = self.file_table[file_name]
-        try:
-            file_obj.seek(entry.offset, 0)
-            data = file_obj.read(entry.size)
-            if len(data) != entry.size:
-                print(f"error: truncated read for '{file_name}'", file=sys.stderr)
-                return None
-            return data
-        except (IOError, OSError) as e:
-            print(f"error reading '{file_name}': {e}", file=sys.stderr)
+        data = pak_data[entry.offset : entry.offset + entry.size]
+        if len(data) != entry.size:
+            print(f"error: truncated read for '{file_name}'", file=sys.stderr)
             return None
+        return data
 
     def list_files(self) -> Dict[str, pak_entry]:
         """return file table"""
@@ -124,27 +142,33 @@ def main() -> int:
 
     try:
         with open(pak_path, "rb") as fin:
-            pak = pak_parser()
-            if not pak.load(fin):
+            if os.fstat(fin.fileno()).st_size == 0:
+                # mmap refuses empty files; report them like load() does a bad magic
+                print("error: invalid magic number, got ", file=sys.stderr)
                 return 1
 
-            if len(sys.argv) == 2:
-                # list files
-                files = pak.list_files()
-                print(f"found {len(files)} files:")
-                for name, entry in files.items():
-                    print(f"  {name:<40} {entry.offset:>8x} {entry.size:>8}")
-            else:
-                # extract specific file
-                file_name = sys.argv[2]
-                data = pak.extract_file(fin, file_name)
-                if data is None:
+            with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as pak_data:
+                pak = pak_parser()
+                if not pak.load(pak_data):
                     return 1
-                sys.stdout.buffer.write(data)
-
-            return 0
 
-    except (IOError, OSError) as e:
+                if len(sys.argv) == 2:
+                    # list files
+                    files = pak.list_files()
+                    print(f"found {len(files)} files:")
+                    for name, entry in files.items():
+                        print(f"  {name:<40} {entry.offset:>8x} {entry.size:>8}")
+                else:
+                    # extract specific file
+                    file_name = sys.argv[2]
+                    data = pak.extract_file(pak_data, file_name)
+                    if data is None:
+                        return 1
+                    sys.stdout.buffer.write(data)
+
+                return 0
+
+    except (IOError, OSError, ValueError) as e:
         print(f"error: {e}", file=sys.stderr)
         return 1
 
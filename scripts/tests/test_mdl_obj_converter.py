@@ -0,0 +1,162 @@
+"""Regression tests for mdl_obj_converter (run from the repo root with
+``python -m unittest discover scripts/tests``)."""
+
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mdl_obj_converter as conv  # noqa: E402
+
+HAVE_NUMPY = conv._import_numpy()
+
+# Encoder output: 9 signature bytes, 67 null bytes, then the five counts
+DATA_OFFSET = 96
+
+OBJ_HEAD = """v 1 2 3
+v 4 5 6
+v 7 8 9
+v 1 1 1
+vt 0 0
+vt 1 0
+vt 1 1
+vn 0 1 0
+"""
+
+
+class ConverterTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def convert(self, obj_text: str, numpy: bool):
+        """MDL bytes for obj_text through the numpy or stdlib path, None on failure."""
+        if numpy and not HAVE_NUMPY:
+            self.skipTest("numpy not installed")
+        source = self.tmp / 'model.obj'
+        target = self.tmp / 'model.mdl'
+        source.write_text(obj_text, encoding='utf-8')
+        target.unlink(missing_ok=True)
+        # every path is taken at any size by moving the numpy threshold
+        with mock.patch.object(conv, 'NUMPY_MIN_RECORDS', 0 if numpy else sys.maxsize), \
+                mock.patch.object(conv, 'log_error', lambda *args: None), \
+                mock.patch.object(conv, 'log_info', lambda *args: None):
+            ok = conv.convert_to_mdl_exact(source, target)
+        return target.read_bytes() if ok else None
+
+    def assert_paths_agree(self, obj_text: str):
+        """Both paths give the same output (or both fail); returns it."""
+        stdlib = self.convert(obj_text, numpy=False)
+        if HAVE_NUMPY:
+            self.assertEqual(self.convert(obj_text, numpy=True), stdlib)
+        return stdlib
+
+    def faces_of(self, mdl: bytes):
+        vertices, uvs, faces = struct.unpack_from('<3I', mdl, 76)
+        offset = DATA_OFFSET + 12 * vertices + 8 * uvs
+        return list(struct.iter_unpack('<6H', mdl[offset:offset + 12 * faces]))
+
+
+class FaceLayoutTest(ConverterTest):
+    def test_triangles_with_normals(self):
+        mdl = self.assert_paths_agree(OBJ_HEAD + "f 1/1/1 2/2/1 3/3/1\n")
+        self.assertEqual(self.faces_of(mdl), [(0, 1, 2, 0, 1, 2)])
+
+    def test_triangles_without_normals(self):
+        mdl = self.assert_paths_agree(OBJ_HEAD + "f 1/3 2/2 4/1\n")
+        self.assertEqual(self.faces_of(mdl), [(0, 1, 3, 2, 1, 0)])
+
+    def test_no_uv_faces_are_rejected(self):
+        # "v//vn" has no UV index to store; the normal must not stand in
+        self.assertIsNone(self.convert(OBJ_HEAD + "f 1//1 2//1 3//1\n", numpy=False))
+        self.assertIsNone(self.convert(OBJ_HEAD + "f 1//1 2//1 3//1\n", numpy=True))
+
+    def test_mixed_layouts(self):
+        # a v/vt/vn quad plus a v/vt triangle averages to 9 indices per face
+        mdl = self.assert_paths_agree(
+            OBJ_HEAD + "f 1/1/1 2/2/1 3/3/1 4/1/1\nf 2/3 3/2 4/1\n")
+        self.assertEqual(self.faces_of(mdl),
+                         [(0, 1, 2, 0, 1, 2), (1, 2, 3, 2, 1, 0)])
+
+    def test_mixed_corners_in_one_face(self):
+        mdl = self.assert_paths_agree(OBJ_HEAD + "f 1/1/1 2/2 3/3/1\n")
+        self.assertEqual(self.faces_of(mdl), [(0, 1, 2, 0, 1, 2)])
+
+
+class FloatRecordTest(ConverterTest):
+    FACE = "f 1/1/1 2/2/1 3/3/1\n"
+    TAIL = "vt 0 0\nvt 1 0\nvt 1 1\n"
+
+    def vertices_of(self, mdl: bytes):
+        count, = struct.unpack_from('<I', mdl, 76)
+        return list(struct.iter_unpack('<3f', mdl[DATA_OFFSET:DATA_OFFSET + 12 * count]))
+
+    def test_plain_records(self):
+        mdl = self.assert_paths_agree(OBJ_HEAD + self.FACE)
+        self.assertEqual(self.vertices_of(mdl)[2:],
+                         [(1, -3, 2), (4, -6, 5), (7, -9, 8), (1, -1, 1)])
+
+    def test_extra_columns_are_ignored(self):
+        mdl = self.assert_paths_agree(
+            "v 1 2 3 1\nv 4 5 6 1\nv 7 8 9 1\n" + self.TAIL + "vn 0 1 0\n" + self.FACE)
+        self.assertEqual(self.vertices_of(mdl)[2:], [(1, -3, 2), (4, -6, 5), (7, -9, 8)])
+
+    def test_ragged_records_are_rejected(self):
+        # 2 + 4 fields add up to two normals' worth of values
+        obj = "v 1 2 3\nv 4 5 6\nv 7 8 9\n" + self.TAIL + "vn 0 1\nvn 0 1 0 1\n" + self.FACE
+        self.assertIsNone(self.assert_paths_agree(obj))
+
+    def test_non_finite_values_are_packed(self):
+        # nan/inf UVs, normals and tags go through as float32 (MDL -> OBJ
+        # writes them back as "nan"/"inf")
+        for value in ('nan', 'inf', '-inf'):
+            with self.subTest(value=value):
+                obj = OBJ_HEAD + f"vt 0 {value}\nvn 0 {value} 0\nAS3DTAG t 0 {value} 0\n"
+                mdl = self.assert_paths_agree(obj + self.FACE)
+                self.assertIsNotNone(mdl)
+                # the file ends with the last normal (X, Z, Y) and the tag
+                # (name, X, -Z, Y); Y holds the value in both
+                tag_offset = len(mdl) - conv.TAG_STRUCT.size
+                normal = struct.unpack_from('<3f', mdl, tag_offset - 12)
+                tag = struct.unpack_from('<3f', mdl, tag_offset + 32)
+                self.assertEqual(repr(normal[2]), repr(float(value)))
+                self.assertEqual(repr(tag[2]), repr(float(value)))
+
+    def test_non_finite_vertices_are_rejected(self):
+        # the bounding box truncates every coordinate to an integer
+        for value in ('nan', 'inf', '-inf'):
+            with self.subTest(value=value):
+                obj = f"v 1 2 3\nv 4 {value} 6\nv 7 8 9\n" + self.TAIL + self.FACE
+                self.assertIsNone(self.assert_paths_agree(obj))
+
+    def test_float32_overflow_is_rejected(self):
+        for record in ("v 0 1e39 0", "vt 0 -1e39", "vn 0 1e39 0", "AS3DTAG t 0 1e39 0"):
+            with self.subTest(record=record):
+                obj = OBJ_HEAD + record + "\n" + self.FACE
+                self.assertIsNone(self.assert_paths_agree(obj))
+
+    def test_malformed_numbers_are_rejected(self):
+        obj = "v 1 2 3\nv 4-5 6\nv 7 8 9\n" + self.TAIL + self.FACE
+        self.assertIsNone(self.assert_paths_agree(obj))
+
+    def test_plain_records_take_the_fast_path(self):
+        if not HAVE_NUMPY:
+            self.skipTest("numpy not installed")
+        values = conv._parse_floats_fast(["1 2 3", " 4.5\t-6e2 7 "], 3)
+        self.assertIsNotNone(values)
+        self.assertEqual(values.tolist(), [[1, 2, 3], [4.5, -600, 7]])
+        # records of other widths or odd tokens go to the per-line fallback
+        for lines in (["1 2 3 1"], ["1 2"], ["4-5 6"], ["1 nan 3"], ["0x1 2 3"]):
+            with self.subTest(lines=lines):
+                self.assertIsNone(conv._parse_floats_fast(lines, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()